@@ -9,9 +9,13 @@ from nbt.nbt import TAG_List, TAG_Compound
 import aiohttp
 import asyncio
 import traceback
+import os
 from datetime import datetime
+from auctionRecord import AuctionRecord, json_default
 
 DECODE_ERROR_LOG = 'decode_errors.log'
+# Override to point at a local stub (scripts/generate_synthetic_auctions.py serve)
+API_BASE = os.environ.get('HYPIXEL_API_BASE', 'https://api.hypixel.net').rstrip('/')
 
 def log_decode_error(context, exc):
     """Append a JSON line describing a decode failure for later analysis."""
@@ -32,6 +36,71 @@ def log_decode_error(context, exc):
     except Exception as log_exc:
         print(f"Logging failure (ignored): {log_exc}")
 
+class JsonListWriter:
+    """Stream a JSON list to `path` one element at a time.
+
+    Output matches json.dump(items, f, indent=4). Write errors are printed
+    with `error_msg` once and further writes are skipped, mirroring the
+    try/except around the old whole-list dumps.
+    """
+    def __init__(self, path, default=None, error_msg=None):
+        self.default = default
+        self.error_msg = error_msg or f"Error: Failed to write {path}: "
+        self.count = 0
+        try:
+            self.f = open(path, 'w')
+        except Exception as e:
+            print(self.error_msg, e)
+            self.f = None
+
+    def write(self, obj):
+        if self.f is None:
+            return
+        try:
+            text = json.dumps(obj, indent=4, default=self.default).replace('\n', '\n    ')
+            self.f.write(('[\n    ' if self.count == 0 else ',\n    ') + text)
+            self.count += 1
+        except Exception as e:
+            print(self.error_msg, e)
+            self.f.close()
+            self.f = None
+
+    def close(self):
+        if self.f is None:
+            return
+        try:
+            self.f.write('\n]' if self.count else '[]')
+        except Exception as e:
+            print(self.error_msg, e)
+        finally:
+            self.f.close()
+            self.f = None
+
+def make_keys(a, options):
+    """Set the composite `key` and `base_key` on a processed AuctionRecord."""
+    parts = []
+    if a.ench2:
+        ench_part = ','.join([
+            f"{e}={a.ench2[e]}" for e in options.get('relevant_enchants', {})
+            if e in a.ench2 and a.ench2[e] in options['relevant_enchants'][e]
+        ])
+        if ench_part:
+            parts.append(ench_part)
+    if a.rarities:
+        parts.append(','.join(a.rarities))
+    if a.reforges:
+        parts.append(','.join(a.reforges))
+    if a.recomb:
+        parts.append('rarity_upgrade')
+    if a.color is not None:
+        parts.append(f"color={a.color}")
+    if a.attributes:
+        attrs = ','.join([f"{k}={a.attributes[k]}" for k in a.attributes])
+        if attrs:
+            parts.append(attrs)
+    a.key = a.id + '.' + '+'.join(parts)
+    a.base_key = a.id
+
 def decode_item_bytes(b, context=None):
     """Decode base64 NBT item bytes into a Python structure; returns None if fails."""
     try:
@@ -56,16 +125,11 @@ def main():
     with open('options.json') as f:
         options = json.load(f)
 
-    def json_default(o):
-        if isinstance(o, (bytes, bytearray)):
-            return base64.b64encode(o).decode('ascii')
-        return str(o)
-
     # 2. Fetch auctions
     print("Getting auctions...")
     async def fetch_auctions():
         async with aiohttp.ClientSession() as session:
-            async with session.get("https://api.hypixel.net/skyblock/auctions_ended") as response:
+            async with session.get(f"{API_BASE}/skyblock/auctions_ended") as response:
                 try:
                     return await response.json()
                 except Exception as e:
@@ -77,107 +141,50 @@ def main():
         json.dump(data0, f, indent=4)
     auctions = data0.get('auctions', [])
     auctions = [x for x in auctions if x.get('bin') and x.get('buyer')]
+    del data0
 
-    # 3. Decode NBT
-    decoded = []
+    # 3-7. Decode NBT, extract detail.i[0], build compact records, key them
+    # and write the JSON snapshots in one pass so each decoded tree is
+    # released as soon as its record exists.
+    decoded_out = JsonListWriter('auctions.json', default=json_default, error_msg="Error: Failed to write auctions.json: ")
+    processed_out = JsonListWriter('auctions2.json', default=json_default, error_msg="Error: Failed to write auctions2.json")
+    processed = []
     failures = 0
+    missing_detail = 0
     for x in auctions:
         ctx = {
             'auction_id': x.get('auction_id') or x.get('uuid') or x.get('id'),
             'price': x.get('price'),
             'timestamp': x.get('timestamp'),
         }
-        detail = decode_item_bytes(x.get('item_bytes'), context=ctx)
-        if detail is None:
+        full_nbt = decode_item_bytes(x.get('item_bytes'), context=ctx)
+        if full_nbt is None:
             failures += 1
             continue
-        decoded.append({**x, 'detail': detail, 'full_nbt': detail})
-    if failures:
-        print(f"Warning: {failures} item(s) failed to decode (see {DECODE_ERROR_LOG}).")
-    auctions = decoded
-    try:
-        with open('auctions.json', 'w') as f:
-            json.dump(auctions, f, indent=4, default=json_default)
-    except Exception as e:
-        print("Error: Failed to write auctions.json: ", e)
-
-    # 4. Extract detail.i[0]
-    filtered = []
-    missing_detail = 0
-    for x in auctions:
+        decoded_out.write({**x, 'detail': full_nbt, 'full_nbt': full_nbt})
         try:
-            filtered.append({**x, 'detail': x['detail']['i'][0], 'full_nbt': x.get('full_nbt')})
+            detail = full_nbt['i'][0]
         except Exception as e:
             missing_detail += 1
             log_decode_error({'stage': 'extract_i0', 'auction_id': x.get('auction_id') or x.get('uuid'), 'reason': 'detail.i[0] missing'}, e)
-    if missing_detail:
-        print(f"Warning: {missing_detail} decoded item(s) lacked expected structure (logged).")
-    auctions = filtered
-
-    # 5. Build processed list
-    processed = []
-    for x in auctions:
+            continue
         try:
-            detail = x['detail']
-            ea = detail['tag']['ExtraAttributes']
-            display = detail['tag'].get('display', {})
-            rec = {
-                'timestamp': x['timestamp'],
-                'price': x['price'],
-                'unitprice': x['price'] / detail['Count'] if detail.get('Count') else None,
-                'count': detail.get('Count'),
-                'ench1': detail['tag'].get('ench'),
-                'ench2': ea.get('enchantments'),
-                'recomb': ea.get('rarity_upgrades'),
-                'color': str(display.get('color')) if display.get('color') is not None else None,
-                'attributes': ea.get('attributes'),
-                'gems': ({k: v['quality'] for k, v in ea.get('gems', {}).items() if k != 'unlocked_slots' and isinstance(v, dict)}
-                         if ea.get('gems') and any(k != 'unlocked_slots' and isinstance(v, dict) and 'quality' in v for k, v in ea.get('gems', {}).items()) else None),
-                'lore': [l.replace('§.', '') for l in display.get('Lore', [])],
-                'name': display.get('Name'),
-                'id': ea.get('id'),
-                'item_bytes': x.get('item_bytes'),
-                'full_nbt': x.get('full_nbt')
-            }
-            processed.append(rec)
+            rec = AuctionRecord.from_auction(x, detail, full_nbt, options)
         except Exception as e:
             log_decode_error({'stage': 'process_record'}, e)
+            continue
+        make_keys(rec, options)
+        processed_out.write(rec.to_dict(detail, full_nbt))
+        processed.append(rec)
+    decoded_out.close()
+    processed_out.close()
+    if failures:
+        print(f"Warning: {failures} item(s) failed to decode (see {DECODE_ERROR_LOG}).")
+    if missing_detail:
+        print(f"Warning: {missing_detail} decoded item(s) lacked expected structure (logged).")
     auctions = processed
 
-    # 6. Create composite + base keys
-    for a in auctions:
-        parts = []
-        if a.get('ench2'):
-            ench_part = ','.join([
-                f"{e}={a['ench2'][e]}" for e in options.get('relevant_enchants', {})
-                if e in a['ench2'] and a['ench2'][e] in options['relevant_enchants'][e]
-            ])
-            if ench_part:
-                parts.append(ench_part)
-        lore_rarities = [r for r in options.get('rarities', []) if r in a.get('lore', [])]
-        if lore_rarities:
-            parts.append(','.join(lore_rarities))
-        reforges_present = [r for r in options.get('reforges', []) if a.get('name') and r in a['name']]
-        if reforges_present:
-            parts.append(','.join(reforges_present))
-        if a.get('recomb'):
-            parts.append('rarity_upgrade')
-        if a.get('color') is not None:
-            parts.append(f"color={a['color']}")
-        if a.get('attributes'):
-            attrs = ','.join([f"{k}={a['attributes'][k]}" for k in a['attributes']])
-            if attrs:
-                parts.append(attrs)
-        a['key'] = a.get('id', 'UNKNOWN') + '.' + '+'.join(parts)
-        a['base_key'] = a.get('id')
-
-    # 7. Dump processed JSON snapshots
-    try:
-        with open('auctions2.json', 'w') as f:
-            json.dump(auctions, f, indent=4, default=json_default)
-    except Exception as e:
-        print("Error: Failed to write auctions2.json", e)
-    auctions3 = [{k: x[k] for k in ('timestamp','key','unitprice')} for x in auctions]
+    auctions3 = [{'timestamp': x.timestamp, 'key': x.key, 'unitprice': x.unitprice} for x in auctions]
     with open('auctions3.json', 'w') as f:
         json.dump(auctions3, f, indent=4, default=json_default)
 
@@ -265,45 +272,40 @@ def main():
     c2.execute("CREATE INDEX IF NOT EXISTS idx_pricesV2_itemkey ON pricesV2(itemkey)")
     c2.execute("CREATE INDEX IF NOT EXISTS idx_pricesV2_timestamp ON pricesV2(timestamp)")
     for a in auctions:
-        full_nbt_json = json.dumps(a.get('full_nbt'), ensure_ascii=False)
-        ench_json = json.dumps(a.get('ench2'), ensure_ascii=False) if a.get('ench2') else None
+        ench_json = json.dumps(a.ench2, ensure_ascii=False) if a.ench2 else None
         c2.execute(
             "INSERT INTO pricesV2 (timestamp, itemkey, base_key, unitprice, count, recomb, color, name, raw_item_bytes, full_nbt_json, ench) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (a['timestamp'], a.get('key'), a.get('base_key'), a.get('unitprice'), a.get('count'), 1 if a.get('recomb') else 0, a.get('color'), a.get('name'), a.get('item_bytes'), full_nbt_json, ench_json)
+            (a.timestamp, a.key, a.base_key, a.unitprice, a.count, 1 if a.recomb else 0, a.color, a.name, a.item_bytes, a.full_nbt_json, ench_json)
         )
         price_id = c2.lastrowid
-        if a.get('ench2'):
-            for ench, lvl in a['ench2'].items():
+        if a.ench2:
+            for ench, lvl in a.ench2.items():
                 try:
                     c2.execute("INSERT INTO item_enchants (price_id, enchant, level) VALUES (?, ?, ?)", (price_id, ench, lvl))
                 except Exception as e:
                     log_decode_error({'stage': 'insert_enchant', 'ench': ench, 'lvl': lvl, 'price_id': price_id}, e)
-        if a.get('attributes'):
-            for attr, val in a['attributes'].items():
+        if a.attributes:
+            for attr, val in a.attributes.items():
                 try:
                     c2.execute("INSERT INTO item_attributes (price_id, attribute, value) VALUES (?, ?, ?)", (price_id, attr, val))
                 except Exception as e:
                     log_decode_error({'stage': 'insert_attribute', 'attr': attr, 'val': val, 'price_id': price_id}, e)
-        if a.get('gems'):
-            for gem, quality in a['gems'].items():
+        if a.gems:
+            for gem, quality in a.gems.items():
                 try:
                     c2.execute("INSERT INTO item_gems (price_id, gem, quality) VALUES (?, ?, ?)", (price_id, gem, quality))
                 except Exception as e:
                     log_decode_error({'stage': 'insert_gem', 'gem': gem, 'quality': quality, 'price_id': price_id}, e)
-        if a.get('lore'):
-            for r in (options.get('rarities') or []):
-                if r in a['lore']:
-                    try:
-                        c2.execute("INSERT INTO item_rarities (price_id, rarity) VALUES (?, ?)", (price_id, r))
-                    except Exception as e:
-                        log_decode_error({'stage': 'insert_rarity', 'rarity': r, 'price_id': price_id}, e)
-        if a.get('name') and options.get('reforges'):
-            for reforge in options['reforges']:
-                if reforge in a['name']:
-                    try:
-                        c2.execute("INSERT INTO item_reforges (price_id, reforge) VALUES (?, ?)", (price_id, reforge))
-                    except Exception as e:
-                        log_decode_error({'stage': 'insert_reforge', 'reforge': reforge, 'price_id': price_id}, e)
+        for r in a.rarities:
+            try:
+                c2.execute("INSERT INTO item_rarities (price_id, rarity) VALUES (?, ?)", (price_id, r))
+            except Exception as e:
+                log_decode_error({'stage': 'insert_rarity', 'rarity': r, 'price_id': price_id}, e)
+        for reforge in a.reforges:
+            try:
+                c2.execute("INSERT INTO item_reforges (price_id, reforge) VALUES (?, ?)", (price_id, reforge))
+            except Exception as e:
+                log_decode_error({'stage': 'insert_reforge', 'reforge': reforge, 'price_id': price_id}, e)
     conn2.commit(); c2.close(); conn2.close()
 
     print(f"Completed processing {len(auctions)} auctions (V2 records inserted).")
@@ -0,0 +1,114 @@
+import base64
+import json
+import sys
+
+def json_default(o):
+    if isinstance(o, (bytes, bytearray)):
+        return base64.b64encode(o).decode('ascii')
+    return str(o)
+
+def _intern(s):
+    return sys.intern(s) if isinstance(s, str) else s
+
+class AuctionRecord:
+    """Compact processed auction: only the fields the keying and DB stages use.
+
+    The decoded NBT tree is serialised to `full_nbt_json` once on construction
+    and then dropped; lore is reduced to the rarities it names and the name to
+    the reforges it contains. Short repeated strings are interned.
+    """
+    __slots__ = (
+        'timestamp', 'price', 'unitprice', 'count', 'ench2', 'recomb', 'color',
+        'attributes', 'gems', 'rarities', 'reforges', 'name', 'id',
+        'item_bytes', 'full_nbt_json', 'key', 'base_key',
+    )
+
+    def __init__(self, timestamp, price, unitprice, count, ench2, recomb, color,
+                 attributes, gems, rarities, reforges, name, id, item_bytes, full_nbt_json):
+        self.timestamp = timestamp
+        self.price = price
+        self.unitprice = unitprice
+        self.count = count
+        self.ench2 = ench2
+        self.recomb = recomb
+        self.color = _intern(color)
+        self.attributes = attributes
+        self.gems = gems
+        self.rarities = rarities
+        self.reforges = reforges
+        self.name = name
+        self.id = _intern(id)
+        self.item_bytes = item_bytes
+        self.full_nbt_json = full_nbt_json
+        self.key = None
+        self.base_key = None
+
+    @classmethod
+    def from_auction(cls, x, detail, full_nbt, options):
+        """Build a record from a raw auction, its decoded `detail.i[0]` and the
+        full decoded tree. The caller can drop `full_nbt` afterwards.
+
+        Raises on malformed items (missing tag / ExtraAttributes) just like the
+        previous inline dict construction did. Byte arrays in the tree are
+        base64-encoded via json_default, as in the JSON snapshots.
+        """
+        ea = detail['tag']['ExtraAttributes']
+        display = detail['tag'].get('display', {})
+        gems_raw = ea.get('gems')
+        gems = ({_intern(k): v['quality'] for k, v in gems_raw.items() if k != 'unlocked_slots' and isinstance(v, dict)}
+                if gems_raw and any(k != 'unlocked_slots' and isinstance(v, dict) and 'quality' in v for k, v in gems_raw.items()) else None)
+        ench2 = ea.get('enchantments')
+        if ench2:
+            ench2 = {_intern(k): v for k, v in ench2.items()}
+        attributes = ea.get('attributes')
+        if attributes:
+            attributes = {_intern(k): v for k, v in attributes.items()}
+        lore = [l.replace('§.', '') for l in display.get('Lore', [])]
+        rarities = tuple(_intern(r) for r in (options.get('rarities') or []) if r in lore)
+        name = display.get('Name')
+        reforges = tuple(_intern(r) for r in (options.get('reforges') or []) if name and r in name)
+        color = display.get('color')
+        return cls(
+            timestamp=x['timestamp'],
+            price=x['price'],
+            unitprice=x['price'] / detail['Count'] if detail.get('Count') else None,
+            count=detail.get('Count'),
+            ench2=ench2,
+            recomb=ea.get('rarity_upgrades'),
+            color=str(color) if color is not None else None,
+            attributes=attributes,
+            gems=gems,
+            rarities=rarities,
+            reforges=reforges,
+            name=name,
+            id=ea.get('id'),
+            item_bytes=x.get('item_bytes'),
+            full_nbt_json=json.dumps(full_nbt, ensure_ascii=False, default=json_default),
+        )
+
+    def to_dict(self, detail, full_nbt):
+        """auctions2.json entry in the same layout as before AuctionRecord.
+
+        Lore, `ench` and the tree are not kept on the record, so this takes the
+        decoded `detail` / `full_nbt` and must run before they are dropped.
+        """
+        display = detail['tag'].get('display', {})
+        return {
+            'timestamp': self.timestamp,
+            'price': self.price,
+            'unitprice': self.unitprice,
+            'count': self.count,
+            'ench1': detail['tag'].get('ench'),
+            'ench2': self.ench2,
+            'recomb': self.recomb,
+            'color': self.color,
+            'attributes': self.attributes,
+            'gems': self.gems,
+            'lore': [l.replace('§.', '') for l in display.get('Lore', [])],
+            'name': self.name,
+            'id': self.id,
+            'item_bytes': self.item_bytes,
+            'full_nbt': full_nbt,
+            'key': self.key,
+            'base_key': self.base_key,
+        }
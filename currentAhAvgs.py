@@ -2,10 +2,13 @@ import requests
 import sqlite3
 import json
 import concurrent.futures
+import os
 from itemKeyMaker import decode_item_bytes, create_item_key
 
+API_BASE = os.environ.get('HYPIXEL_API_BASE', 'https://api.hypixel.net').rstrip('/')
+
 def fetch_auctions(page, session):
-    url = f"https://api.hypixel.net/skyblock/auctions?bin=true&page={page}"
+    url = f"{API_BASE}/skyblock/auctions?bin=true&page={page}"
     response = session.get(url)
     if response.status_code != 200:
         print(f"Error fetching page {page}: HTTP {response.status_code}")
@@ -76,7 +79,7 @@ def main():
         options = json.load(f)
 
     session = requests.Session()
-    temp_response = session.get("https://api.hypixel.net/skyblock/auctions?bin=true&page=0")
+    temp_response = session.get(f"{API_BASE}/skyblock/auctions?bin=true&page=0")
     if temp_response.status_code != 200:
         print(f"Error fetching total pages: HTTP {temp_response.status_code}")
         return
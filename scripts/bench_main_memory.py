@@ -0,0 +1,177 @@
+"""Memory benchmark for the processed-auction stage of __main__.main().
+
+Two measurements on N auctions cloned from the auctions.json fixture:
+
+1. Retained bytes per record and tracemalloc peak of the processed list,
+   built in-process with the pre-AuctionRecord dicts and with AuctionRecord.
+   Each clone gets its own decoded tree (parsed from the fixture's full_nbt,
+   standing in for the NBT decode). The dict side is reported twice: with
+   the step-3/4 `decoded` / `filtered` lists kept alive as the old main() did,
+   and for the processed dicts on their own.
+2. Peak RSS of a real main() run in a scratch directory with the
+   auctions_ended fetch stubbed to read the same scaled payload. --main runs
+   another checkout's __main__.py, e.g. `git worktree add /tmp/base <rev>`.
+
+Usage:
+  python scripts/bench_main_memory.py [--count N] [--main path] [--skip-rss]
+"""
+from __future__ import annotations
+import argparse, gc, json, shutil, subprocess, sys, tempfile, time, tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from auctionRecord import AuctionRecord  # noqa: E402
+
+# Executed in the child: replace aiohttp.ClientSession with a stub whose
+# response.json() loads the payload file, run main(), print ru_maxrss (KiB).
+CHILD = r"""
+import json, os, resource, runpy, sys
+import aiohttp
+main_path, payload = sys.argv[1], sys.argv[2]
+
+class _Response:
+    async def json(self):
+        with open(payload) as f:
+            return json.load(f)
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, *exc):
+        return False
+
+class _Session:
+    def get(self, url):
+        return _Response()
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, *exc):
+        return False
+
+aiohttp.ClientSession = _Session
+sys.path.insert(0, os.path.dirname(os.path.abspath(main_path)))
+sys.argv = [main_path]
+runpy.run_path(main_path, run_name='__main__')
+print('MAXRSS_KB', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+RAW_KEYS = ('auction_id', 'seller', 'seller_profile', 'buyer', 'buyer_profile', 'timestamp', 'price', 'bin', 'item_bytes')
+
+def load_fixture() -> list[dict]:
+    with open(ROOT / 'auctions.json') as f:
+        return [a for a in json.load(f) if a.get('item_bytes') and a.get('full_nbt')]
+
+def scaled_auctions(fixture: list[dict], n: int) -> list[dict]:
+    """auctions_ended entries: fixture auctions repeated to n with unique ids."""
+    out = []
+    for i in range(n):
+        a = fixture[i % len(fixture)]
+        x = {k: a[k] for k in RAW_KEYS if k in a}
+        x['auction_id'] = f"{i:032x}"
+        out.append(x)
+    return out
+
+def baseline_dict(x: dict, options: dict) -> dict:
+    """Step 5 + 6 of main() as they were before AuctionRecord."""
+    detail = x['detail']
+    ea = detail['tag']['ExtraAttributes']
+    display = detail['tag'].get('display', {})
+    rec = {
+        'timestamp': x['timestamp'],
+        'price': x['price'],
+        'unitprice': x['price'] / detail['Count'] if detail.get('Count') else None,
+        'count': detail.get('Count'),
+        'ench1': detail['tag'].get('ench'),
+        'ench2': ea.get('enchantments'),
+        'recomb': ea.get('rarity_upgrades'),
+        'color': str(display.get('color')) if display.get('color') is not None else None,
+        'attributes': ea.get('attributes'),
+        'gems': ({k: v['quality'] for k, v in ea.get('gems', {}).items() if k != 'unlocked_slots' and isinstance(v, dict)}
+                 if ea.get('gems') and any(k != 'unlocked_slots' and isinstance(v, dict) and 'quality' in v for k, v in ea.get('gems', {}).items()) else None),
+        'lore': [l.replace('§.', '') for l in display.get('Lore', [])],
+        'name': display.get('Name'),
+        'id': ea.get('id'),
+        'item_bytes': x.get('item_bytes'),
+        'full_nbt': x.get('full_nbt'),
+    }
+    rec['key'] = None
+    rec['base_key'] = rec['id']
+    return rec
+
+def traced(build) -> tuple[int, int]:
+    """Run build() under tracemalloc; return (retained, peak) bytes."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current, peak
+
+def measure_records(raw: list[dict], trees: list[str], options: dict) -> None:
+    n = len(raw)
+
+    def dicts_with_stage_lists():
+        decoded = [{**x, 'detail': t, 'full_nbt': t} for x, t in ((x, json.loads(trees[i % len(trees)])) for i, x in enumerate(raw))]
+        filtered = [{**x, 'detail': x['detail']['i'][0], 'full_nbt': x.get('full_nbt')} for x in decoded]
+        return decoded, filtered, [baseline_dict(x, options) for x in filtered]
+
+    def dicts_only():
+        processed = []
+        for i, x in enumerate(raw):
+            t = json.loads(trees[i % len(trees)])
+            processed.append(baseline_dict({**x, 'detail': t['i'][0], 'full_nbt': t}, options))
+        return processed
+
+    def records():
+        processed = []
+        for i, x in enumerate(raw):
+            t = json.loads(trees[i % len(trees)])
+            processed.append(AuctionRecord.from_auction(x, t['i'][0], t, options))
+        return processed
+
+    for label, build in (('dict + step 3/4 lists', dicts_with_stage_lists), ('dict only', dicts_only), ('AuctionRecord', records)):
+        current, peak = traced(build)
+        print(f"{label:>22}: {current / n:8.0f} B/record  retained {current / 2**20:8.1f} MiB  peak {peak / 2**20:8.1f} MiB")
+
+def run_main(main_path: Path, payload: Path) -> tuple[float, float]:
+    """Return (peak RSS MiB, seconds) for one main() run in a scratch dir."""
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(ROOT / 'options.json', tmp)
+        start = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, '-c', CHILD, str(main_path), str(payload)],
+            cwd=tmp, capture_output=True, text=True, check=True,
+        ).stdout
+        elapsed = time.perf_counter() - start
+    rss = [line for line in out.splitlines() if line.startswith('MAXRSS_KB')]
+    if not rss:
+        raise RuntimeError(f"main() produced no RSS line:\n{out}")
+    return int(rss[-1].split()[1]) / 1024, elapsed
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--count', type=int, default=100_000)
+    ap.add_argument('--main', default=str(ROOT / '__main__.py'), help='__main__.py to run for the RSS measurement')
+    ap.add_argument('--skip-rss', action='store_true', help='only measure the processed list')
+    args = ap.parse_args()
+
+    with open(ROOT / 'options.json') as f:
+        options = json.load(f)
+    fixture = load_fixture()
+    raw = scaled_auctions(fixture, args.count)
+    print(f"{args.count} auctions from {len(fixture)} fixture items")
+    measure_records(raw, [json.dumps(a['full_nbt']) for a in fixture], options)
+
+    if not args.skip_rss:
+        with tempfile.TemporaryDirectory() as tmp:
+            payload = Path(tmp) / 'payload.json'
+            with open(payload, 'w') as f:
+                json.dump({'success': True, 'auctions': raw}, f)
+            del raw
+            peak, elapsed = run_main(Path(args.main), payload)
+        print(f"main() {args.main}: peak RSS {peak:.1f} MiB, {elapsed:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,320 @@
+"""Deterministic synthetic auction generator for offline load / scale testing.
+
+Uses the items in auctions.json as templates and varies enchants (from
+options.json relevant_enchants / tier_6 / tier_7), reforges, rarities,
+attributes, gems, colors and prices. Every variant is re-encoded as valid
+gzip NBT base64 `item_bytes`, so the output goes through the real decode
+path in __main__.py and currentAhAvgs.py.
+
+Encoding NBT is the slow part, so a fixed pool of `--variants` items is built
+once and auctions sample from it (prices, ids and timestamps stay unique per
+auction). The same --seed always yields byte-identical output, and any single
+auction / page can be regenerated on its own (the stub server relies on this).
+
+By default about 10% of ended auctions are non-BIN (--bin-ratio 0.9), and
+main() skips those, so --count N feeds roughly 0.9 * N auctions into the
+pipeline. Pass --bin-ratio 1 to size capacity runs exactly.
+
+Modes:
+  ended   one auctions_ended-shaped JSON object    (--out file.json)
+  paged   auctions?page=N-shaped pages             (--out dir/ -> page_<N>.json)
+  serve   local stub HTTP server for both endpoints (--port)
+
+Examples:
+  python scripts/generate_synthetic_auctions.py ended --count 100000 --out synthetic_ended.json
+  python scripts/generate_synthetic_auctions.py paged --count 1000000 --out synthetic_pages
+  python scripts/generate_synthetic_auctions.py serve --count 10000000 --port 8765
+  HYPIXEL_API_BASE=http://127.0.0.1:8765 python __main__.py
+"""
+from __future__ import annotations
+import argparse, base64, gzip, io, json, random, re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from nbt.nbt import NBTFile, TAG_Compound, TAG_Int, TAG_List, TAG_String
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGE_SIZE = 1000  # matches the live /skyblock/auctions page size
+
+ATTRIBUTES = [
+    "arachno_resistance", "blazing_resistance", "breeze", "dominance", "experience",
+    "fortitude", "life_regeneration", "lifeline", "magic_find", "mana_pool",
+    "mana_regeneration", "speed", "undead_resistance", "veteran", "vitality",
+]
+GEM_SLOTS = ["AMBER_0", "COMBAT_0", "JADE_0", "PERIDOT_0", "RUBY_0", "SAPPHIRE_0"]
+GEM_QUALITIES = ["ROUGH", "FLAWED", "FINE", "FLAWLESS", "PERFECT"]
+RARITY_RE = re.compile(r"\b(VERY_SPECIAL|VERY SPECIAL|UNCOMMON|COMMON|RARE|EPIC|LEGENDARY|MYTHIC|DIVINE|SPECIAL|SUPREME)\b")
+COLOR_CODE_RE = re.compile("§.")
+
+def load_templates() -> list[dict]:
+    with open(ROOT / "auctions.json") as f:
+        auctions = json.load(f)
+    return [
+        {"item_bytes": a["item_bytes"], "price": a["price"], "timestamp": a["timestamp"]}
+        for a in auctions if a.get("item_bytes")
+    ]
+
+def load_options() -> dict:
+    with open(ROOT / "options.json") as f:
+        return json.load(f)
+
+def _compound(parent: TAG_Compound, name: str) -> TAG_Compound:
+    if name not in parent:
+        parent[name] = TAG_Compound()
+    return parent[name]
+
+def encode_nbt(nbt_file: NBTFile) -> str:
+    buf = io.BytesIO()
+    nbt_file.write_file(buffer=buf)
+    # mtime=0 keeps the gzip header (and so item_bytes) deterministic
+    return base64.b64encode(gzip.compress(buf.getvalue(), mtime=0)).decode("ascii")
+
+def make_variant(rng: random.Random, template: dict, options: dict) -> dict:
+    """Decode a template, mutate its NBT and re-encode it."""
+    nbt_file = NBTFile(fileobj=io.BytesIO(base64.b64decode(template["item_bytes"])))
+    item = nbt_file["i"][0]
+    tag = _compound(item, "tag")
+    ea = _compound(tag, "ExtraAttributes")
+    display = _compound(tag, "display")
+
+    enchant_pool = {}
+    for group in ("relevant_enchants", "tier_6_enchants", "tier_7_enchants", "regular_relevant_enchants"):
+        for ench, levels in options.get(group, {}).items():
+            enchant_pool.setdefault(ench, []).extend(levels)
+    if "enchantments" in ea or rng.random() < 0.3:
+        enchants = _compound(ea, "enchantments")
+        for ench in rng.sample(sorted(enchant_pool), k=rng.randint(1, 3)):
+            enchants[ench] = TAG_Int(rng.choice(enchant_pool[ench]))
+
+    rarity = rng.choice(options.get("rarities") or ["COMMON"])
+    if "Lore" not in display:
+        display["Lore"] = TAG_List(type=TAG_String)
+    lore = display["Lore"].tags
+    if lore:
+        lore[-1].value = RARITY_RE.sub(rarity, lore[-1].value, count=1)
+    # main() only matches a lore line that equals the rarity once '§.' is
+    # stripped, which the coloured line above never does; half the items
+    # also get a plain rarity line so the item_rarities path is exercised.
+    if rng.random() < 0.5:
+        lore.append(TAG_String(rarity))
+
+    reforge = None
+    if options.get("reforges") and rng.random() < 0.6:
+        reforge = rng.choice(options["reforges"])
+        ea["modifier"] = TAG_String(reforge.lower())
+    name = display["Name"].value if "Name" in display else ea["id"].value if "id" in ea else "Item"
+    if reforge:
+        prefix = "".join(COLOR_CODE_RE.findall(name)[:1])
+        name = f"{prefix}{reforge} {COLOR_CODE_RE.sub('', name)}"
+        display["Name"] = TAG_String(name)
+
+    if rng.random() < 0.15:
+        ea["rarity_upgrades"] = TAG_Int(1)
+    if "color" in display or rng.random() < 0.1:
+        display["color"] = TAG_Int(rng.randrange(0x1000000))
+    if "attributes" in ea or rng.random() < 0.15:
+        attributes = _compound(ea, "attributes")
+        for attr in rng.sample(ATTRIBUTES, k=rng.randint(1, 2)):
+            attributes[attr] = TAG_Int(rng.randint(1, 10))
+    if "gems" in ea or rng.random() < 0.1:
+        gems = _compound(ea, "gems")
+        for slot in rng.sample(GEM_SLOTS, k=rng.randint(1, 3)):
+            quality = rng.choice(GEM_QUALITIES)
+            # Both the legacy string form and the {quality: ...} form occur live
+            if rng.random() < 0.5:
+                gems[slot] = TAG_String(quality)
+            else:
+                gem = TAG_Compound()
+                gem["quality"] = TAG_String(quality)
+                gems[slot] = gem
+
+    return {
+        "item_bytes": encode_nbt(nbt_file),
+        "price": template["price"],
+        "item_name": COLOR_CODE_RE.sub("", name),
+        "tier": rarity,
+        "count": item["Count"].value if "Count" in item else 1,
+    }
+
+class SyntheticAuctions:
+    """Deterministic, randomly addressable source of `count` synthetic auctions."""
+
+    def __init__(self, count: int, seed: int = 0, variants: int = 2000, page_size: int = PAGE_SIZE,
+                 bin_ratio: float = 0.9):
+        self.count = count
+        self.bin_ratio = bin_ratio
+        self.seed = seed
+        self.page_size = page_size
+        templates = load_templates()
+        options = load_options()
+        rng = random.Random(seed)
+        self.pool = [make_variant(rng, rng.choice(templates), options) for _ in range(min(variants, max(count, 1)))]
+        self.last_updated = max(t["timestamp"] for t in templates)
+
+    @property
+    def total_pages(self) -> int:
+        return max(1, -(-self.count // self.page_size))
+
+    def _rng(self, i: int) -> random.Random:
+        return random.Random(self.seed * 0x9E3779B1 + i)
+
+    def _base(self, i: int):
+        rng = self._rng(i)
+        variant = self.pool[rng.randrange(len(self.pool))]
+        price = max(1, int(variant["price"] * rng.lognormvariate(0, 0.5)))
+        # Spread auctions over the hour before last_updated
+        ts = self.last_updated - (i * 3_600_000) // max(self.count, 1)
+        return rng, variant, price, ts
+
+    def ended(self, i: int) -> dict:
+        rng, variant, price, ts = self._base(i)
+        return {
+            "auction_id": f"{rng.getrandbits(128):032x}",
+            "seller": f"{rng.getrandbits(128):032x}",
+            "seller_profile": f"{rng.getrandbits(128):032x}",
+            "buyer": f"{rng.getrandbits(128):032x}",
+            "buyer_profile": f"{rng.getrandbits(128):032x}",
+            "timestamp": ts,
+            "price": price,
+            "bin": rng.random() < self.bin_ratio,
+            "item_bytes": variant["item_bytes"],
+        }
+
+    def active(self, i: int) -> dict:
+        rng, variant, price, ts = self._base(i)
+        return {
+            "uuid": f"{rng.getrandbits(128):032x}",
+            "auctioneer": f"{rng.getrandbits(128):032x}",
+            "profile_id": f"{rng.getrandbits(128):032x}",
+            "coop": [],
+            "start": ts,
+            "end": ts + 86_400_000,
+            "item_name": variant["item_name"],
+            "item_lore": "",
+            "extra": variant["item_name"],
+            "category": "misc",
+            "tier": variant["tier"],
+            "starting_bid": price,
+            "item_bytes": variant["item_bytes"],
+            "claimed": False,
+            "claimed_bidders": [],
+            "highest_bid_amount": 0,
+            "last_updated": ts,
+            "bin": True,
+            "bids": [],
+        }
+
+    def iter_ended(self):
+        for i in range(self.count):
+            yield self.ended(i)
+
+    def page(self, page: int) -> dict:
+        start = page * self.page_size
+        stop = min(start + self.page_size, self.count)
+        return {
+            "success": True,
+            "page": page,
+            "totalPages": self.total_pages,
+            "totalAuctions": self.count,
+            "lastUpdated": self.last_updated,
+            "auctions": [self.active(i) for i in range(start, stop)],
+        }
+
+def write_ended(gen: SyntheticAuctions, out) -> None:
+    """Stream an auctions_ended payload without holding it in memory."""
+    out.write(f'{{"success": true, "lastUpdated": {gen.last_updated}, "auctions": [')
+    for i, auction in enumerate(gen.iter_ended()):
+        if i:
+            out.write(", ")
+        out.write(json.dumps(auction))
+    out.write("]}")
+
+def write_pages(gen: SyntheticAuctions, out_dir: Path) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for page in range(gen.total_pages):
+        with open(out_dir / f"page_{page}.json", "w") as f:
+            json.dump(gen.page(page), f)
+
+def serve(gen: SyntheticAuctions, host: str, port: int) -> None:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/skyblock/auctions_ended":
+                self._start(200)
+                writer = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=False)
+                write_ended(gen, writer)
+                writer.flush()
+                writer.detach()
+            elif url.path == "/skyblock/auctions":
+                try:
+                    page = int(parse_qs(url.query).get("page", ["0"])[0])
+                except ValueError:
+                    page = -1
+                if 0 <= page < gen.total_pages:
+                    self._start(200)
+                    self.wfile.write(json.dumps(gen.page(page)).encode("utf-8"))
+                else:
+                    self._start(404)
+                    self.wfile.write(b'{"success": false, "cause": "Page not found"}')
+            else:
+                self._start(404)
+                self.wfile.write(b'{"success": false, "cause": "Unknown endpoint"}')
+
+        def _start(self, status: int):
+            # HTTP/1.0 without Content-Length: body ends when the connection closes
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving {gen.count} synthetic auctions ({gen.total_pages} pages) on http://{host}:{port}")
+    print(f"  HYPIXEL_API_BASE=http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("mode", choices=["ended", "paged", "serve"])
+    ap.add_argument("--count", type=int, default=10_000, help="number of auctions (default 10000)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--variants", type=_positive_int, default=2000, help="distinct encoded items to sample from")
+    ap.add_argument("--page-size", type=_positive_int, default=PAGE_SIZE)
+    ap.add_argument("--bin-ratio", type=float, default=0.9,
+                    help="share of ended auctions marked BIN (default 0.9); main() skips the rest, use 1 for exact --count")
+    ap.add_argument("--out", help="output file (ended) or directory (paged)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args(argv)
+
+    gen = SyntheticAuctions(args.count, seed=args.seed, variants=args.variants, page_size=args.page_size,
+                           bin_ratio=args.bin_ratio)
+    if args.mode == "serve":
+        serve(gen, args.host, args.port)
+        return 0
+    if not args.out:
+        ap.error("--out is required for ended / paged modes")
+    if args.mode == "ended":
+        with open(args.out, "w") as f:
+            write_ended(gen, f)
+        print(f"Wrote {gen.count} ended auctions -> {args.out}")
+    else:
+        write_pages(gen, Path(args.out))
+        print(f"Wrote {gen.total_pages} pages ({gen.count} auctions) -> {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())